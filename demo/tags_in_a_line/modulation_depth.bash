@@ -1,14 +1,18 @@
 LOGFILE="$(dirname "$0")/../../logs/$(ls ../../logs | grep '\.json$' | tail -n 1)"
 
-jq -r -s '
-map(select(.tag != null and .voltage != null)) |
+# Stream the NDJSON log one record at a time, keeping only a running
+# min/max voltage per tag instead of slurping the whole file into memory.
+jq -n -r '
+reduce (inputs | select(.tag != null and .voltage != null)) as $r ({};
+  ($r.tag | tostring) as $key |
+  .[$key] |= {
+    tag: $r.tag,
+    min_voltage: ([.min_voltage // $r.voltage, $r.voltage] | min),
+    max_voltage: ([.max_voltage // $r.voltage, $r.voltage] | max)
+  }
+) |
+[.[]] |
 sort_by(.tag) |
-group_by(.tag) |
-map({
-  tag: .[0].tag,
-  min_voltage: (map(.voltage) | min),
-  max_voltage: (map(.voltage) | max)
-}) |
 map({
   tag: .tag,
   modulation_depth: ( .max_voltage - .min_voltage ),
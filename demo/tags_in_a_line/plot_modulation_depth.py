@@ -11,10 +11,9 @@ def plot_modulation_depth():
         "processed.csv", delimiter=",", dtype=None, names=True, encoding="utf-8"
     )
 
-    tags = [
-        (int(tag.strip('"')) * DISTANCE_INCREMENT) + DISTANCE_OFFSET
-        for tag in data["tag"]
-    ]
+    tags = (
+        np.char.strip(data["tag"], '"').astype(int) * DISTANCE_INCREMENT
+    ) + DISTANCE_OFFSET
     modulation_depths = data["modulation_depth"]
 
     plt.figure()
@@ -24,7 +23,7 @@ def plot_modulation_depth():
     plt.xlabel("Distance (meters)")
     plt.ylabel("Modulation Depth")
     plt.grid(True)
-    plt.xlim(min(tags), max(tags))
+    plt.xlim(tags.min(), tags.max())
 
     plt.show()
 
@@ -11,6 +11,8 @@ class Event(ABC):
     An abstract base class representing an Event that can be run.
     """
 
+    __slots__ = ("id", "event_type", "time", "args", "prepare_actions")
+
     id_gen = id_generator()
 
     def __init__(self, parser: EventParser):
@@ -12,7 +12,10 @@ class EventParser:
     Represents the data for an event loaded from a config file.
     """
 
+    __slots__ = ("event_type", "time", "args")
+
     def __init__(self, **kwargs):
+        # event_type is casefolded once here; downstream code relies on this
         self.event_type: str = kwargs.pop("event_type").casefold()
         self.time: SimTime = kwargs.pop("time")
         self.args: dict = kwargs
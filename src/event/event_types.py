@@ -1,4 +1,4 @@
-from typing import Callable, Dict
+from typing import Callable, Dict, Optional
 from event.base_event import Event
 from event.tag_event import TagSetModeEvent
 
@@ -15,6 +15,14 @@ class EventTypes:
     }
 
     def create_event(event_parser: EventParser) -> Event:
-        event_type: str = event_parser.event_type.lower()
-        creator: CreateEvent = EventTypes.event_types[event_type]
+        creator: Optional[CreateEvent] = _DISPATCH.get(event_parser.event_type)
+        if creator is None:
+            known = ", ".join(_DISPATCH)
+            raise ValueError(
+                f"Unknown event type {event_parser.event_type!r}, expected one of: {known}"
+            )
         return creator(event_parser)
+
+
+# Bound once so create_event skips the class attribute lookup per event
+_DISPATCH: Dict[str, CreateEvent] = EventTypes.event_types
@@ -7,6 +7,8 @@ from tags.tag import Tag, TagMode
 
 
 class TagEvent(Event):
+    __slots__ = ("tag",)
+
     def __init__(self, parser: EventParser):
         super().__init__(parser)
         self.tag: Tag
@@ -31,6 +33,7 @@ class TagEvent(Event):
 
 
 class TagSetModeEvent(TagEvent):
+    __slots__ = ("mode",)
 
     def __init__(self, parser: EventParser):
         super().__init__(parser)
@@ -1,50 +1,59 @@
 import argparse
-import bisect
-import heapq
+import functools
 import json
 import logging
 import os
 import sys
-from typing import Optional, List
-
-from event.load_events import load_event, load_events, sort_events
-from manager.run_program import run_simulation
-from tags.tag import *
-from tags.state_machine import *
-from event.base_event import *
+from types import MappingProxyType
+from typing import Callable, Dict, Optional, Self
+
+from event.load_events import insert_event, load_event, load_events, sort_events
+from event.base_event import Event
+from state import AppState
+from tags.state_machine import State, StateSerializer, TagMachine
+from tags.tag import Exciter, Tag
 from util.app_logger import init_logger
 
 CONFIG_PATH = "./src/config/config.json"
 STATE_PATH = "./src/config/states.json"
 EVENT_PATH = "./src/config/events.json"
 
-DEFAULT_STATS = {
-    "exciter_power": 500.0,
-    "gain": 0.0,
-    "impedance": 50,
-    "frequency": 100,
-    "passive_ref_mag": 0.01,
-    "input_machine_id": "UNKNOWN",
-    "proccessing_machine_id": "UNKNOWN",
-    "output_machine_id": "UNKNOWN",
-    "chip_impedances": [],
-}
+# Machine id held by the defaults until a state machine is assigned
+UNDEFINED_MACHINE = "UNKNOWN"
+
+# Read-only template; callers that edit defaults take a dict() copy of it
+DEFAULT_STATS = MappingProxyType(
+    {
+        "exciter_power": 500.0,
+        "gain": 0.0,
+        "impedance": 50,
+        "frequency": 100,
+        "passive_ref_mag": 0.01,
+        "input_machine_id": UNDEFINED_MACHINE,
+        "proccessing_machine_id": UNDEFINED_MACHINE,
+        "output_machine_id": UNDEFINED_MACHINE,
+        "chip_impedances": (),
+    }
+)
 
+# Names accepted by parse_default, by the kind of value they take
+NUMERIC_DEFAULTS = frozenset(
+    {"exciter_power", "impedance", "gain", "frequency", "passive_ref_mag"}
+)
+MACHINE_DEFAULTS = frozenset({"input", "proccessing", "output"})
 
-def load_json(
-    file_input: str,
-    serializer: StateSerializer,
-    app_state: Optional[AppState] = None,
-    default: Optional[dict] = None,
-):
+
+def default_exciters(app_state: Optional[AppState]) -> dict:
     """
-    Loads config file, collecting information the simulator needs to run.
+    Builds the exciter setup used when a config doesn't define any exciters.
+
+    Args:
+        app_state (AppState): The app state.
 
     Returns:
-        exciters,tags,events,default: List of information stored in the JSON file.
+        exciters (dict): A single exciter at the origin with default stats.
     """
-
-    default_exciters = {
+    return {
         "defaultEx": Exciter(
             app_state,
             "default",
@@ -55,13 +64,101 @@ def load_json(
             DEFAULT_STATS["frequency"],
         )
     }
-    if os.path.exists(file_input):
-        with open(file_input, "r") as f:
+
+
+def load_config_data(
+    raw_data: dict, serializer: StateSerializer, app_state: Optional[AppState] = None
+):
+    """
+    Builds the exciters and tags from a parsed config file.
+
+    Args:
+        raw_data (dict): Parsed contents of the config file.
+        serializer (StateSerializer): Serializer used to look up the tags' states.
+        app_state (AppState, optional): Global state shared by the new objects.
+
+    Returns:
+        exciters,tags,events,default: Exciters, tags and defaults from the config.
+    """
+    raw_objects = raw_data.get("Objects", {})
+    raw_exciters = raw_data.get("Exciters", {})
+
+    default = raw_data.get("Default")
+    if raw_exciters:
+        # exciter = Exciter.from_dict(app_state, raw_exciters.get(next(iter(raw_exciters))))
+
+        exciters = {
+            id: Exciter.from_dict(app_state, val) for id, val in raw_exciters.items()
+        }
+    else:
+        exciters = default_exciters(app_state)
+    tags = {
+        id: Tag.from_dict(app_state, id, val, serializer, default)
+        for id, val in raw_objects.items()
+    }
+    return exciters, tags, None, default
+
+
+def load_state_machine_data(
+    raw_data: dict, serializer: StateSerializer, default: Optional[dict] = None
+):
+    """
+    Registers the states from a parsed state machine file.
+
+    Args:
+        raw_data (dict): Parsed contents of the state machine file.
+        serializer (StateSerializer): Serializer the states are registered with.
+        default (dict, optional): Defaults to update with the machine's initial states.
+
+    Returns:
+        exciters,tags,events,default: Updated defaults if the file names a machine type.
+    """
+    return None, None, None, load_states(raw_data, serializer, default)
+
+
+def load_events_data(raw_data: dict):
+    """
+    Builds the sorted event list from a parsed events file.
+
+    Args:
+        raw_data (dict): Parsed contents of the events file.
+
+    Returns:
+        exciters,tags,events,default: Events from the file.
+    """
+    events: list[Event] = load_events(raw_data.get("Events"))
+    return None, None, events, None
+
+
+# Loaders for each JSON "Format", called with the parsed file contents, the
+# state serializer, the app state and the current defaults
+JSON_FORMATS: Dict[str, Callable] = {
+    "config": lambda raw, ser, app, dft: load_config_data(raw, ser, app),
+    "state_machine": lambda raw, ser, app, dft: load_state_machine_data(raw, ser, dft),
+    "events": lambda raw, ser, app, dft: load_events_data(raw),
+}
+
+
+def load_json(
+    file_input: str,
+    serializer: StateSerializer,
+    app_state: Optional[AppState] = None,
+    default: Optional[dict] = None,
+):
+    """
+    Loads config file, collecting information the simulator needs to run.
+
+    Returns:
+        exciters,tags,events,default: List of information stored in the JSON file.
+    """
+
+    try:
+        with open(file_input, "rb") as f:
             try:
-                raw_data = json.load(f)
+                raw_data = json.loads(f.read())
             except json.JSONDecodeError:
                 if file_input == CONFIG_PATH:
-                    return default_exciters, {}, None, DEFAULT_STATS
+                    return default_exciters(app_state), {}, None, dict(DEFAULT_STATS)
                 elif file_input == EVENT_PATH:
                     return None, None, [], None
                 elif file_input == STATE_PATH:
@@ -69,44 +166,36 @@ def load_json(
                 else:
                     print("error: file doesn't exist")
                     sys.exit(1)
-        format = raw_data.get("Format")
-        if format == "config":
-            raw_objects = raw_data.get("Objects", {})
-            raw_exciters = raw_data.get("Exciters", {})
-
-            default = raw_data.get("Default")
-            if raw_exciters:
-                # exciter = Exciter.from_dict(app_state, raw_exciters.get(next(iter(raw_exciters))))
-
-                exciters = {
-                    id: Exciter.from_dict(app_state, raw_exciters.get(id))
-                    for id, val in raw_exciters.items()
-                }
-            else:
-                exciters = default_exciters
-            tags = {
-                id: Tag.from_dict(app_state, id, val, serializer, default)
-                for id, val in raw_objects.items()
-            }
-            return exciters, tags, None, default
-        elif format == "state_machine":
-            state_output = load_states(raw_data, serializer, default)
-            if state_output is not None:
-                return None, None, None, state_output
-        elif format == "events":
-            events: list[Event] = load_events(raw_data.get("Events"))
-            return None, None, events, None
+    except FileNotFoundError:
+        if file_input == CONFIG_PATH:
+            return default_exciters(app_state), {}, [], dict(DEFAULT_STATS)
+        elif file_input == STATE_PATH:
+            return {}, None, None, None
         else:
-            print("error: invalid JSON format")
+            print("error: file doesn't exist")
             sys.exit(1)
-    elif file_input == CONFIG_PATH:
-        return default_exciters, {}, [], DEFAULT_STATS
-    elif file_input == STATE_PATH:
-        return {}, None, None, None
-    else:
-        print("error: file doesn't exist")
+    loader = JSON_FORMATS.get(raw_data.get("Format"))
+    if loader is None:
+        print("error: invalid JSON format")
         sys.exit(1)
-    return None, None, None, None
+    return loader(raw_data, serializer, app_state, default)
+
+
+def write_json(file_output: str, data: dict):
+    """
+    Writes a dict to a JSON file. The file is replaced in one step, so it is
+    never left half written.
+
+    Args:
+        file_output (str): Path of the file to write.
+        data (dict): Data to store.
+    """
+    # Encoded up front so the file is written with a single call
+    buf = json.dumps(data, indent=4).encode()
+    tmp_output = file_output + ".tmp"
+    with open(tmp_output, "wb") as f:
+        f.write(buf)
+    os.replace(tmp_output, file_output)
 
 
 def save_config(
@@ -123,48 +212,37 @@ def save_config(
         tags (dict): Dictionary of the tags that are in the system.
         events (list[Event]): List of events that simulation will peform.
     """
-    with open(CONFIG_PATH, "w") as f:
-        json.dump(
-            {
-                "Format": "config",
-                "Default": {
-                    "exciter_power": default["exciter_power"],  # (mW)
-                    "gain": 0,  # (dBi) Isotropic by default
-                    "impedance": default["impedance"],  # (ohms),
-                    "frequency": default["frequency"],  # Unit?
-                    "passive_ref_mag": default["passive_ref_mag"],
-                    "input_machine_id": default["input_machine_id"],
-                    "proccessing_machine_id": default["proccessing_machine_id"],
-                    "output_machine_id": default["output_machine_id"],
-                    "chip_impedances": default["chip_impedances"],
-                },
-                "Exciters": {id: obj.to_dict() for id, obj in exciters.items()},
-                "Objects": {id: obj.to_dict() for id, obj in objects.items()},
-            },
-            f,
-            indent=4,
-        )
-    with open(STATE_PATH, "w") as f:
-        json.dump(
-            {
-                "Format": "state_machine",
-                "states": serializer.to_dict(),
-            },
-            f,
-            indent=4,
-        )
-    with open(EVENT_PATH, "w") as f:
-        json.dump(
-            {
-                "Format": "events",
-                "Events": [e.to_dict() for e in events] if events is not None else [],
-            },
-            f,
-            indent=4,
-        )
+    config_data = {
+        "Format": "config",
+        "Default": {
+            "exciter_power": default["exciter_power"],  # (mW)
+            "gain": 0,  # (dBi) Isotropic by default
+            "impedance": default["impedance"],  # (ohms),
+            "frequency": default["frequency"],  # Unit?
+            "passive_ref_mag": default["passive_ref_mag"],
+            "input_machine_id": default["input_machine_id"],
+            "proccessing_machine_id": default["proccessing_machine_id"],
+            "output_machine_id": default["output_machine_id"],
+            "chip_impedances": default["chip_impedances"],
+        },
+        "Exciters": {id: obj.to_dict() for id, obj in exciters.items()},
+        "Objects": {id: obj.to_dict() for id, obj in objects.items()},
+    }
+    state_data = {
+        "Format": "state_machine",
+        "states": serializer.to_dict(),
+    }
+    event_data = {
+        "Format": "events",
+        "Events": [e.to_dict() for e in events] if events is not None else [],
+    }
 
+    write_json(CONFIG_PATH, config_data)
+    write_json(STATE_PATH, state_data)
+    write_json(EVENT_PATH, event_data)
 
-def parse_obj(vals: list):
+
+def parse_obj(vals: list[str]) -> tuple[str, float, float, float]:
     """
     Verifies the correctness of tag arguments.
 
@@ -174,16 +252,16 @@ def parse_obj(vals: list):
     Returns:
         id, x, y, z: The tag ID, followed by coordinates verified to be floats.
     """
-    id = vals[0]
     try:
-        coords = [float(v) for v in vals[1:]]
-    except ValueError:
-        print("error: coordinates given are not numerical values")
+        x, y, z = float(vals[1]), float(vals[2]), float(vals[3])
+    except ValueError as e:
+        # e names the value that failed to convert
+        print("error: coordinates given are not numerical values:", e)
         sys.exit(1)
-    return id, coords[0], coords[1], coords[2]
+    return vals[0], x, y, z
 
 
-def parse_default(vals, default: dict, serializer: StateSerializer) -> dict:
+def parse_default(vals: list[str], default: dict, serializer: StateSerializer) -> dict:
     """
     Parses argumnet values to fill out default value correctly.
 
@@ -195,13 +273,7 @@ def parse_default(vals, default: dict, serializer: StateSerializer) -> dict:
     Returns:
         default (dict): Updated dictionary.
     """
-    if vals[0].lower() in [
-        "exciter_power",
-        "impedance",
-        "gain",
-        "frequency",
-        "passive_ref_mag",
-    ]:
+    if vals[0].lower() in NUMERIC_DEFAULTS:
         try:
             val = float(vals[1])
             default[vals[0]] = val
@@ -209,7 +281,7 @@ def parse_default(vals, default: dict, serializer: StateSerializer) -> dict:
             print("error: invalid values for default")
             sys.exit(1)
         return default
-    elif vals[0] in ["input", "proccessing", "output"]:
+    elif vals[0] in MACHINE_DEFAULTS:
         val = ""
         val += vals[0]
         val += "_machine_id"
@@ -219,7 +291,7 @@ def parse_default(vals, default: dict, serializer: StateSerializer) -> dict:
         else:
             print("error: state machine {" + vals[1] + "} does not exist")
             sys.exit(1)
-    elif vals[0] in ["chip_impedances"]:
+    elif vals[0] == "chip_impedances":
         try:
             default[vals[0]] = list(map(int, vals[1].split(",")))
         except ValueError:
@@ -230,12 +302,13 @@ def parse_default(vals, default: dict, serializer: StateSerializer) -> dict:
     sys.exit(1)
 
 
-def parse_args() -> argparse.Namespace:
+@functools.cache
+def build_parser() -> argparse.ArgumentParser:
     """
-    Parses arguments. Handles arguments in any order.
+    Builds the argument parser. Built once and reused, as it never changes.
 
     Returns:
-        arguments (Namespace): Collection of arguments parsed.
+        parser (ArgumentParser): Parser for the simulator's arguments.
     """
     parser = argparse.ArgumentParser(description="Tag-to-Tag Network Simulator")
     parser.add_argument(
@@ -244,17 +317,17 @@ def parse_args() -> argparse.Namespace:
         metavar=("ID", "X", "Y", "Z"),
         required=False,
         help="Place a tag with a unique ID at coordinates (X, Y, Z).",
-    ),
+    )
     parser.add_argument(
         "--exciter",
         nargs=4,
         metavar=("ID", "X", "Y", "Z"),
         required=False,
         help="Moves an exciter with a unique ID to coordinates (X, Y, Z).",
-    ),
+    )
     parser.add_argument(
         "--remove", type=str, required=False, help="Removes tag with this specific ID."
-    ),
+    )
     parser.add_argument(
         "--print",
         type=str,
@@ -262,45 +335,45 @@ def parse_args() -> argparse.Namespace:
         help="Prints out information.",
         required=False,
         # default="default"
-    ),
+    )
     parser.add_argument(
         "--event",
         nargs=3,
         metavar=("time", "tag", "event_type"),
         help="Specifies an event that will be simulated.",
-    ),
+    )
     parser.add_argument(
         "--event_transmission",
         metavar="transmission",
         nargs=1,
         help='Adds a transmission to an event. To be appended to an "--event" argument.',
-    ),
+    )
     parser.add_argument(
         "--event_chip_impedance_index",
         nargs=1,
         help='Adds a chip impedance index to an event. To be appended to an "--event" argument',
-    ),
+    )
     parser.add_argument(
         "--event_mode",
         type=str,
         choices=["listen", "transmit"],
         nargs=1,
         help='Adds a mode to an event. To be appended to an "--event" argument.',
-    ),
+    )
     parser.add_argument(
         "--default", nargs=2, metavar=("name", "value"), help="Changes a default value."
-    ),
-    parser.add_argument("--load", type=str, help="Text file to be loaded in."),
+    )
+    parser.add_argument("--load", type=str, help="Text file to be loaded in.")
     parser.add_argument(
         "--add",
         action="store_true",
         help="Makes loading add onto the existing data rather than overwriting.",
-    ),
+    )
     parser.add_argument(
         "--run",
         action="store_true",
         help="Runs the simulation after all other arguments.",
-    ),
+    )
     log_levels = {
         "ERROR": logging.ERROR,
         "WARNING": logging.WARNING,
@@ -314,7 +387,17 @@ def parse_args() -> argparse.Namespace:
         default="INFO",
         help="Sets the logging level (default: INFO).",
     )
-    return parser.parse_args()
+    return parser
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses arguments. Handles arguments in any order.
+
+    Returns:
+        arguments (Namespace): Collection of arguments parsed.
+    """
+    return build_parser().parse_args()
 
 
 def load_states(
@@ -353,118 +436,313 @@ def load_states(
         return None
 
 
-def load_txt(filepath: str, app_state: AppState, serializer: StateSerializer):
+# Optional event flags, mapped to the event argument each one sets
+EVENT_OPTIONS = {
+    "event_transmission": "transmission",
+    "event_chip_impedance_index": "reflection_index",
+    "event_mode": "mode",
+}
+
+
+def build_event(time: str, tag: str, event_type: str, options: dict[str, str]) -> Event:
     """
-    Loads arguments via a text file. Format is the same as command line arguments.
+    Builds an event from command line or text file values, exiting with an
+    error message if they do not describe a valid event.
 
     Args:
-        filepath (str): Text file to load.
+        time (str): Time the event happens at.
+        tag (str): ID of the tag the event acts on.
+        event_type (str): Type of the event.
+        options (dict): Optional event flags, keyed by their names in EVENT_OPTIONS.
 
     Returns:
-        objects,events,default: Information about the simulation configuration.
-    """
-
-    default = DEFAULT_STATS
-    events = []
-    objects = {}
-    exciters = None
-    if os.path.exists(filepath):
-        with open(filepath, "r") as f:
-            lines = f.readlines()
-            for line in lines:
-                line = line.split("#", 1)[
-                    0
-                ].strip()  # remove comments from loading files. Comments start with #
+        event (Event): The new event.
+    """
+    try:
+        event_args = {"time": int(time), "tag": tag, "event_type": event_type}
+    except ValueError:
+        print("error: event time is not an integer:", time)
+        sys.exit(1)
+    for flag, value in options.items():
+        event_args[EVENT_OPTIONS[flag]] = value
+    if "reflection_index" in event_args:
+        index = event_args["reflection_index"]
+        try:
+            event_args["reflection_index"] = int(index)
+        except ValueError:
+            print("error: chip impedance index is not an integer:", index)
+            sys.exit(1)
+
+    try:
+        return load_event(event_args)
+    except ValueError as e:
+        print("error:", e)
+        sys.exit(1)
+
+
+def get_init_states(
+    default: dict, serializer: StateSerializer
+) -> tuple[State, State, State]:
+    """
+    Looks up the initial states for a new tag's machines from the defaults.
+
+    Args:
+        default (dict): Dictionary with default information.
+        serializer (StateSerializer): Serializer with information about states within the system.
+
+    Returns:
+        init_states (tuple[State, State, State]): Initial input, processing and output states.
+    """
+    return (
+        serializer.get_state(default.get("input_machine_id")),
+        serializer.get_state(default.get("proccessing_machine_id")),
+        serializer.get_state(default.get("output_machine_id")),
+    )
+
+
+class TxtLoader:
+    """
+    Loads arguments via a text file, one command per line. Each command is
+    dispatched through the commands table by its first word.
+    """
+
+    def __init__(self, filepath: str, app_state: AppState, serializer: StateSerializer):
+        """
+        Creates a TxtLoader.
+
+        Args:
+            filepath (str): Text file to load.
+            app_state (AppState): The app state.
+            serializer (StateSerializer): Serializer with information about states within the system.
+        """
+        self.filepath = filepath
+        self.app_state = app_state
+        self.serializer = serializer
+        self.default = dict(DEFAULT_STATS)
+        self.events: list[Event] = []
+        self.objects = {}
+        self.exciters = None
+        # Machine states for new tags, looked up again only when defaults change
+        self.init_states: Optional[tuple[State, State, State]] = None
+
+    def _cmd_tag(self, info: list[str]):
+        """
+        Command that places a tag using the current defaults.
+
+        Args:
+            info (list[str]): The tag ID, followed by its coordinates.
+        """
+        default = self.default
+        if self.init_states is None:
+            self.init_states = get_init_states(default, self.serializer)
+        tagmachine = TagMachine(self.app_state, self.init_states)
+        tag = Tag(
+            self.app_state,
+            info[1],
+            tagmachine,
+            "Listen",
+            info[2:5],
+            0,
+            default["gain"],
+            default["impedance"],
+            [complex(x) for x in default["chip_impedances"]],
+            default["frequency"],
+        )
+        self.objects[info[1]] = tag
+
+    def _cmd_exciter(self, info: list[str]):
+        """
+        Command that places the exciter using the current defaults.
+
+        Args:
+            info (list[str]): The exciter's coordinates.
+        """
+        default = self.default
+        self.exciters = {
+            "default": Exciter(
+                self.app_state,
+                "default",
+                info[1:4],
+                default["exciter_power"],
+                default["gain"],
+                default["impedance"],
+                default["frequency"],
+            )
+        }
+
+    def _cmd_default(self, info: list[str]):
+        """
+        Command that changes a default value.
+
+        Args:
+            info (list[str]): The default's name, followed by its value.
+        """
+        self.default = parse_default(info[1:3], self.default, self.serializer)
+        self.init_states = None
+
+    def _cmd_event(self, info: list[str]):
+        """
+        Command that adds an event. Events are sorted once the whole file is loaded.
+
+        Args:
+            info (list[str]): The event's time, tag and type, followed by optional event arguments.
+        """
+        options = {}
+        i = 4
+        while i + 1 < len(info):
+            flag = info[i].lower()
+            if flag in EVENT_OPTIONS:
+                options[flag] = info[i + 1]
+                i += 2
+            else:
+                i += 1
+        self.events.append(build_event(info[1], info[2], info[3], options))
+
+    def _cmd_load(self, info: list[str]):
+        """
+        Command that loads a JSON config, states or events file.
+
+        Args:
+            info (list[str]): The path of the file to load.
+        """
+        self.init_states = None
+        try:
+            with open(info[1], "rb") as json_file:
+                try:
+                    raw_data = json.loads(json_file.read())
+                except json.JSONDecodeError:
+                    print("Skipping! invalid filepath:", info[1])
+                    return
+        except FileNotFoundError:
+            print("File path: ", info[1], " not found in ", self.filepath)
+            return
+        if raw_data.get("Format") == "state_machine":
+            states_output = load_states(raw_data, self.serializer, self.default)
+            if states_output is not None:
+                self.default = states_output
+        elif raw_data.get("Format") == "events":
+            self.events = load_events(raw_data.get("Events"))
+        elif raw_data.get("Format") == "config":
+            # Built from the data already parsed above rather than reading the file again
+            self.exciters, self.objects, _, self.default = load_config_data(
+                raw_data, self.serializer, self.app_state
+            )
+        else:
+            print("Skipping! invalid format:", info[1])
+
+    commands: Dict[str, Callable[[Self, list[str]], None]] = {
+        "tag": _cmd_tag,
+        "exciter": _cmd_exciter,
+        "default": _cmd_default,
+        "event": _cmd_event,
+        "load": _cmd_load,
+    }
+
+    def load(self):
+        """
+        Reads the file and runs each command in it.
+
+        Returns:
+            exciters,objects,events,default: Information about the simulation configuration.
+        """
+        try:
+            f = open(self.filepath, "r")
+        except FileNotFoundError:
+            print("error: file doesn't exist")
+            sys.exit(1)
+        with f:
+            for line in f:
+                # remove comments from loading files. Comments start with #
+                line = line.partition("#")[0].strip()
                 if not line:  # line is just a comment
                     continue
 
-                info = line.replace("--", "").split(" ")
+                # Drop only a leading "--" so IDs and negative values keep theirs
+                info: list[str] = [token.removeprefix("--") for token in line.split()]
                 info[0] = info[0].lower()
-                if info[0] == "tag":
-
-                    init_states = []
-                    init_states.append(
-                        serializer.get_state(default.get("input_machine_id"))
-                    )
-                    init_states.append(
-                        serializer.get_state(default.get("proccessing_machine_id"))
-                    )
-                    init_states.append(
-                        serializer.get_state(default.get("output_machine_id"))
-                    )
-                    tagmachine = TagMachine(app_state, init_states)
-                    tag = Tag(
-                        app_state,
-                        info[1],
-                        tagmachine,
-                        "Listen",
-                        info[2:5],
-                        0,
-                        default["gain"],
-                        default["impedance"],
-                        [complex(x) for x in default["chip_impedances"]],
-                        default["frequency"],
-                    )
-                    objects[info[1]] = tag
-                elif info[0] == "exciter":
-                    exciters = Exciters(
-                        app_state,
-                        "default",
-                        info[1:4],
-                        default["exciter_power"],
-                        default["gain"],
-                        default["impedance"],
-                        default["frequency"],
-                    )
-                elif info[0] == "default":
-                    default = parse_default(info[1:3], default, serializer)
-                elif info[0] == "event":
-
-                    event_args = {}
-                    event_args["time"] = int(info[1])
-                    event_args["tag"] = info[2]
-                    event_args["event_type"] = info[3]
-                    i = 4
-                    while i + 1 < len(info):
-                        if info[i].lower() == "event_transmission":
-                            event_args["transmission"] = info[i + 1]
-                            i += 2
-                        elif info[i].lower() == "event_chip_impedance_index":
-                            event_args["chip_impedance_index"] = info[i + 1]
-                            i += 2
-                        elif info[i].lower() == "event_mode":
-                            event_args["mode"] = info[i + 1]
-                            i += 2
-                        else:
-                            i += 1
-                    events.append(load_event(event_args))
-                    events = sort_events(events)
-                elif info[0] == "load":
-                    if os.path.exists(info[1]):
-                        with open(info[1], "r") as f:
-                            try:
-                                raw_data = json.load(f)
-                            except json.JSONDecodeError:
-                                print("Skipping! invalid filepath:", info[1])
-                        if raw_data.get("Format") == "state_machine":
-                            states_output = load_states(raw_data, serializer, default)
-                            if states_output is not None:
-                                default = states_output
-                        elif raw_data.get("Format") == "events":
-                            events: List[Event] = load_events(raw_data.get("Events"))
-                        elif raw_data.get("Format") == "config":
-                            exciters, objects, _, default = load_json(  # loads configs
-                                info[1],
-                                serializer,
-                                app_state=app_state,
-                            )
-
-                        else:
-                            print("Skipping! invalid format:", info[1])
-                    else:
-                        print("File path: ", info[1], " not found in ", filepath)
-            print(filepath, "successfully loaded")
-            return exciters, objects, events, default
+                command = TxtLoader.commands.get(info[0])
+                if command is not None:
+                    command(self, info)
+        # Sorted once here rather than after every event line
+        self.events = sort_events(self.events)
+        print(self.filepath, "successfully loaded")
+        return self.exciters, self.objects, self.events, self.default
+
+
+def load_txt(filepath: str, app_state: AppState, serializer: StateSerializer):
+    """
+    Loads arguments via a text file. Format is the same as command line arguments.
+
+    Args:
+        filepath (str): Text file to load.
+
+    Returns:
+        exciters,objects,events,default: Information about the simulation configuration.
+    """
+    return TxtLoader(filepath, app_state, serializer).load()
+
+
+def print_objects(exciters: dict, objects: dict):
+    """
+    Prints out the exciters and tags in the system.
+
+    Args:
+        exciters (dict): Exciters in the system, keyed by ID.
+        objects (dict): Tags in the system, keyed by ID.
+    """
+    if exciters is not None:
+        print("Exciters:", {id: obj.to_dict() for id, obj in exciters.items()})
+    else:
+        print("Exciters: Undefined")
+    for key, value in objects.items():
+        print(f"{key}: {value.to_dict()}")
+
+
+def print_events(events: list[Event]):
+    """
+    Prints out the events in the order they will be simulated.
+
+    Args:
+        events (list[Event]): Events to print, in simulation order.
+    """
+    for index, value in enumerate(events, start=1):
+        print(index, value)
+
+
+def print_default(default: dict):
+    """
+    Prints out the default values.
+
+    Args:
+        default (dict): Default values used for new objects.
+    """
+    units = ["mW", "dBi", "Ohm"]  # for display purpose
+    for i, (key, value) in enumerate(default.items()):
+        if i < 3:
+            print(f"{key}: {value} {units[i]}")
+        else:
+            print(f"{key}: {value}")
+
+
+def print_states(serializer: StateSerializer):
+    """
+    Prints out the states known to the system.
+
+    Args:
+        serializer (StateSerializer): Serializer holding the registered states.
+    """
+    for key, value in serializer.get_state_map().items():
+        print(f"{key}: {value.to_dict()}")
+
+
+# Printers for each "--print" choice, called with the exciters, tags, events,
+# defaults and state serializer
+PRINTERS: Dict[str, Callable] = {
+    "objects": lambda exc, obj, evt, dft, ser: print_objects(exc, obj),
+    "events": lambda exc, obj, evt, dft, ser: print_events(evt),
+    "default": lambda exc, obj, evt, dft, ser: print_default(dft),
+    "states": lambda exc, obj, evt, dft, ser: print_states(ser),
+}
 
 
 def main():
@@ -478,22 +756,30 @@ def main():
     # TODO give tags their approriate tagmodes
     args = parse_args()
 
-    # TODO Change this to take in arguments from the command line
-    logger, q_listener = init_logger(app_state, args.loglevel, stdout=False)
     load_json(STATE_PATH, serializer)
 
     main_exciters, objects, events, default = load_json(  # loads configs
         CONFIG_PATH, serializer, app_state=app_state
     )
 
-    _, _, events, _ = load_json(EVENT_PATH, serializer)  # loads events
+    # Only commands that change the setup need it written back out
+    mutated = any(
+        arg is not None
+        for arg in (
+            args.load,
+            args.exciter,
+            args.tag,
+            args.default,
+            args.remove,
+            args.event,
+        )
+    )
+    run_requested = len(sys.argv) == 1 or args.run
 
-    machine_id_keys = [
-        "input_machine_id",
-        "proccessing_machine_id",
-        "output_machine_id",
-    ]
-    machine_defined = not any(default[k] == "UNKNOWN" for k in machine_id_keys)
+    if mutated or run_requested or args.print == "events":
+        _, _, events, _ = load_json(EVENT_PATH, serializer)  # loads events
+    else:
+        events = []
 
     if args.load is not None:  # load in a file
         file_type = args.load.split(".")[-1]
@@ -504,7 +790,8 @@ def main():
                 )
                 objects.update(add_objects)
                 default.update(add_default)
-                events = list(heapq.merge(events, add_events, key=lambda x: x[0]))
+                events.extend(add_events)
+                sort_events(events)
             else:  # overwrites previouse saved data
                 temp_exciters, objects, events, default = load_txt(
                     args.load, app_state, serializer
@@ -540,9 +827,14 @@ def main():
             default["impedance"],
             default["frequency"],
         )
-        print("Exciter:", id, "moved to", x, y, z)
+        print("Exciter:", ident, "moved to", x, y, z)
 
     if args.tag:
+        machine_defined = UNDEFINED_MACHINE not in (
+            default["input_machine_id"],
+            default["proccessing_machine_id"],
+            default["output_machine_id"],
+        )
         if not machine_defined:
             print(
                 "error: tags missing machine identification. \nuse following command to define them:"
@@ -551,13 +843,7 @@ def main():
             sys.exit(1)
         else:
             id, x, y, z = parse_obj(args.tag)
-            init_states = []
-            init_states.append(serializer.get_state(default.get("input_machine_id")))
-            init_states.append(
-                serializer.get_state(default.get("proccessing_machine_id"))
-            )
-            init_states.append(serializer.get_state(default.get("output_machine_id")))
-            tagmachine = TagMachine(app_state, init_states)
+            tagmachine = TagMachine(app_state, get_init_states(default, serializer))
             new_obj = Tag(
                 app_state,
                 id,
@@ -584,66 +870,38 @@ def main():
             print("unknown id")
 
     if args.print:  ## prints out information
-        lower_args = args.print.lower()
-        match lower_args:
-            case "objects":
-                if main_exciters is not None:
-                    print("Exciters:", main_exciters.to_dict())
-                else:
-                    print("Exciters: Undefined")
-                for key, value in objects.items():
-                    print(f"{key}: {value.to_dict()}")
-            case "events":
-                for index, value in enumerate(events, start=1):
-                    print(index, value)
-            case "default":
-                units = ["mW", "dBi", "Ohm"]  # for display purpose
-                for i, (key, value) in enumerate(default.items()):
-                    if i < 3:
-                        print(f"{key}: {value} {units[i]}")
-                    else:
-                        print(f"{key}: {value}")
-            case "states":
-                for key, value in serializer.get_state_map().items():
-                    print(f"{key}: {value.to_dict()}")
+        printer = PRINTERS[args.print.lower()]
+        printer(main_exciters, objects, events, default, serializer)
 
     # Events will be reconfigure later to work along side events.json
     if args.event:  # adds an event
-        # TODO ask if we can get args.event as a dict rather than a list
-        event = args.event
-        if event[2] not in objects:
-            print("error, unknown tag:", event[2])
-        event_args = {}
-        event_args["time"] = int(event[1])
-        event_args["tag"] = event[2]
-        event_args["event_type"] = event[3]
-        i = 4
-        while i + 1 < len(event):
-            if event[i].lower() == "event_transmission":
-                event_args["transmission"] = event[i + 1]
-                i += 2
-            elif event[i].lower() == "event_chip_impedance_index":
-                event_args["chip_impedance_index"] = event[i + 1]
-                i += 2
-            elif event[i].lower() == "event_mode":
-                event_args["mode"] = event[i + 1]
-                i += 2
-            else:
-                i += 1
-        event_args.update({})  # TODO any kwargs passed in cmd
-
-        new_event = load_event(**event_args)
-        position = bisect.bisect_left(events, new_event)
-        events.insert(position, new_event)
-
-    save_config(main_exciters, objects, events, default, serializer)
-
-    if len(sys.argv) == 1:
-        run_simulation(app_state, main_exciters, objects, events, default)
-    elif args.run:
+        time, tag_id, event_type = args.event
+        if tag_id not in objects:
+            print("error, unknown tag:", tag_id)
+            sys.exit(1)
+        # Optional arguments come from their own flags, each taking one value
+        options = {
+            flag: getattr(args, flag)[0]
+            for flag in EVENT_OPTIONS
+            if getattr(args, flag) is not None
+        }
+        new_event = build_event(time, tag_id, event_type, options)
+        insert_event(events, new_event)
+
+    if mutated:
+        save_config(main_exciters, objects, events, default, serializer)
+
+    if run_requested:
+        # Imported here so edit-only invocations skip loading the physics engine
+        from manager.run_program import run_simulation
+
+        # Set up only for runs so edit-only invocations leave no empty log files
+        # TODO Change this to take in arguments from the command line
+        _, q_listener = init_logger(app_state, args.loglevel, stdout=False)
         run_simulation(app_state, main_exciters, objects, events, default)
+        if q_listener is not None:
+            q_listener.stop()
 
-    q_listener.stop()
     logging.shutdown()
 
 
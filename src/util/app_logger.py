@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from datetime import datetime
 import logging
@@ -13,6 +13,10 @@ from state import AppState
 if TYPE_CHECKING:
     from tags.tag import Tag
 
+# Record layouts shared by every logger init_logger sets up
+TEXT_LOG_FORMAT = "t=%(simpy_time)s::%(levelname)s::%(name)s: %(message)s"
+JSON_LOG_FORMAT = "%(simpy_time)s %(levelname)s %(message)s"
+
 
 # Add sympy time to logging
 class TimeInjector(logging.Filter):
@@ -25,6 +29,34 @@ class TimeInjector(logging.Filter):
         return True
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """
+    A FileHandler that lets records collect in a large write buffer instead of
+    flushing the file after every record. The buffer is written out when it
+    fills, and when the handler is closed at shutdown.
+    """
+
+    def __init__(self, filename, buffer_size=1 << 16, **kwargs):
+        # Set before FileHandler.__init__, which opens the file
+        self.buffer_size = buffer_size
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        # _builtin_open keeps working while the interpreter shuts down
+        return self._builtin_open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def flush(self):
+        # StreamHandler.emit flushes after each record; closing the stream
+        # writes the buffer out instead
+        pass
+
+
 def verify_log_directory(base_filename: str):
     """
     Verifies that the log directory exists, and creates it if it does not.
@@ -34,8 +66,7 @@ def verify_log_directory(base_filename: str):
                      the directory where the log will be stored.
     """
     directory = os.path.dirname(base_filename)
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
 
 
 def init_logger(
@@ -44,7 +75,8 @@ def init_logger(
     logger_name=None,
     base_filename="tagsim.log",
     stdout=False,
-) -> tuple[logging.Logger, QueueListener]:
+    threaded=False,
+) -> tuple[logging.Logger, Optional[QueueListener]]:
     """
     Initializes a logger that can be used throughout the program.
 
@@ -53,9 +85,12 @@ def init_logger(
         filename (str): Name of the file where the log is to be stored, tagsim.log in
         PWD/logs by default.
         stdout (bool): Whether or not to print Log to stdout. False by default.
+        threaded (bool): Whether to hand records to a background listener thread
+        through a queue. False by default, in which case handlers write directly.
 
     Returns:
-        logger, queue_listener (tuple[logging.Logger, QueueListener]): Logger objects.
+        logger, queue_listener (tuple[logging.Logger, Optional[QueueListener]]): Logger
+        objects. The queue listener is None when not threaded.
     """
     directory = "./logs"
     base_filename = os.path.join(directory, base_filename)
@@ -67,10 +102,10 @@ def init_logger(
 
     # Create formatters
     text_formatter = logging.Formatter(
-        fmt=f"t=%(simpy_time)s::%(levelname)s::%(name)s: %(msg)s",
+        fmt=TEXT_LOG_FORMAT,
     )
     json_formatter = JsonFormatter(
-        fmt="%(simpy_time)s %(levelname)s %(message)s",
+        fmt=JSON_LOG_FORMAT,
         rename_fields={
             "simpy_time": "time",
             "levelname": "level",
@@ -78,19 +113,13 @@ def init_logger(
         },
     )
 
-    # Create queue for threaded l
-    log_queue = queue.Queue()
-    queue_handler = QueueHandler(log_queue)
-    queue_handler.addFilter(TimeInjector(app_state))
-    logger.addHandler(queue_handler)
-
     time_format = datetime.now().strftime("%Y-%m-%d_%Hh%Mm%Ss")
 
     # Output JSON
-    json_file_handler = logging.FileHandler(f"{base_filename}-{time_format}.json")
+    json_file_handler = BufferedFileHandler(f"{base_filename}-{time_format}.json")
     json_file_handler.setFormatter(json_formatter)
 
-    info_file_handler = logging.FileHandler(f"{base_filename}-{time_format}.log")
+    info_file_handler = BufferedFileHandler(f"{base_filename}-{time_format}.log")
     info_file_handler.setLevel(logging.INFO)
     info_file_handler.setFormatter(text_formatter)
 
@@ -102,6 +131,19 @@ def init_logger(
         stream_handler.setFormatter(text_formatter)
         handlers.append(stream_handler)
 
+    if not threaded:
+        time_injector = TimeInjector(app_state)
+        for handler in handlers:
+            handler.addFilter(time_injector)
+            logger.addHandler(handler)
+        return logger, None
+
+    # Create queue for threaded logging
+    log_queue = queue.Queue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(TimeInjector(app_state))
+    logger.addHandler(queue_handler)
+
     ql = QueueListener(log_queue, *handlers, respect_handler_level=True)
     ql.start()
 